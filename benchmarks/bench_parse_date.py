@@ -0,0 +1,54 @@
+"""Compara `parse_date` (apply linha a linha) com `parse_datas` (vetorizada) numa planilha sintética.
+
+Uso: python benchmarks/bench_parse_date.py [linhas]
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dados import parse_date, parse_datas  # noqa: E402
+
+
+def gerar_coluna(linhas, seed=42):
+    """Mistura os dois formatos aceitos, células vazias, números e textos inválidos."""
+    aleatorio = random.Random(seed)
+    valores = []
+    for _ in range(linhas):
+        dia, mes, ano = aleatorio.randint(1, 28), aleatorio.randint(1, 12), aleatorio.randint(2022, 2025)
+        sorteio = aleatorio.random()
+        if sorteio < 0.55:
+            valores.append(f"{dia:02d}/{mes:02d}/{ano} {aleatorio.randint(0, 23):02d}:{aleatorio.randint(0, 59):02d}")
+        elif sorteio < 0.9:
+            valores.append(f"{dia:02d}/{mes:02d}/{ano}")
+        elif sorteio < 0.95:
+            valores.append("")
+        elif sorteio < 0.97:
+            valores.append(aleatorio.randint(1, 99999))
+        else:
+            valores.append(f"{ano}-{mes:02d}-{dia:02d}")
+    return pd.Series(valores, dtype=object)
+
+
+def medir(funcao, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    coluna = gerar_coluna(linhas)
+    tempo_antigo, antigo = medir(lambda: coluna.apply(parse_date))
+    tempo_novo, novo = medir(lambda: parse_datas(coluna))
+    assert antigo.equals(novo), "parse_datas diverge de parse_date"
+    print(f"{linhas} linhas")
+    print(f"parse_date (apply): {tempo_antigo * 1000:8.1f} ms")
+    print(f"parse_datas:        {tempo_novo * 1000:8.1f} ms  ({tempo_antigo / tempo_novo:.1f}x)")
@@ -0,0 +1,198 @@
+"""Mede cada etapa do dashboard numa planilha sintética de vários tamanhos, sem rede nem credenciais.
+
+Etapas: parse (valores da planilha -> DataFrame tipado), filtro (índices e
+fatias de cada funcionário), prazo (classificação dentro/fora), agregacao
+(cubo, resumo de cada funcionário e relatório de bonificação), tabelas
+(resultados da página e HTML das tabelas) e graficos (PNGs, sem cache).
+Tempo é o melhor de algumas repetições; memória é o pico do `tracemalloc`
+numa execução à parte. Os números são comparados com `baseline.json`.
+
+Uso:
+    python benchmarks/bench_pipeline.py                      # 1k, 10k, 100k e 1M linhas
+    python benchmarks/bench_pipeline.py --tamanhos 1000,10000
+    python benchmarks/bench_pipeline.py --gravar-baseline    # grava os números atuais como referência
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dados  # noqa: E402
+import filtros  # noqa: E402
+import graficos  # noqa: E402
+import medicao  # noqa: E402
+import metricas  # noqa: E402
+import tabelas  # noqa: E402
+from sintetico import gerar_planilha  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+INICIO, FIM = date(2023, 1, 1), date(2024, 12, 31)
+
+
+def _parse(planilha):
+    valores = planilha["Tarefas"]
+    df_tarefas = dados.preparar_tarefas(dados._para_dataframe(valores[0], valores[1:], 2))
+    df_usuarios = dados._para_dataframe(planilha["IDs Usuários"][0], planilha["IDs Usuários"][1:], 2)
+    return dados.tipar_tarefas(df_tarefas) + (df_usuarios,)
+
+
+def _filtro(df_tarefas, funcionarios):
+    filtro = filtros.FiltroTarefas(df_tarefas)
+    for funcionario in funcionarios:
+        filtro.tarefas_do_funcionario(funcionario, INICIO, FIM)
+        filtro.tarefas_envolvendo(funcionario, INICIO, FIM)
+
+
+def _agregacao(df_tarefas, funcionarios):
+    cubo = metricas.CuboMetricas(df_tarefas)
+    for funcionario in funcionarios:
+        cubo.resumo(funcionario, INICIO, FIM)
+    metricas.relatorio_bonificacao(cubo, funcionarios, INICIO, FIM)
+
+
+def _tabelas(df_tarefas, df_textos, amostra):
+    tabelas._cache.clear()  # mede a renderização, não o cache das tabelas
+    for funcionario in amostra:
+        medida = medicao.medir(df_tarefas, df_textos, funcionario, INICIO, FIM)
+        tabelas.html_tabela(medida["resultado_medicao"], "result-table", cabecalho=False,
+                            linha_mesclada=(medida["bonificacao"], medida["cor_bonificacao"]))
+        for chave in ["resumo_prazo", "resumo_aprovados", "resumo_status", "resumo_atribuicoes",
+                      "sugestoes", "desvios", "nao_conformidades"]:
+            tabelas.html_tabela(medida[chave])
+
+
+def _graficos(df_tarefas, df_textos, funcionario):
+    medida = medicao.medir(df_tarefas, df_textos, funcionario, INICIO, FIM)
+    # __wrapped__: a função sem o lru_cache, para medir a renderização de verdade
+    graficos.grafico_prazo.__wrapped__(medida["dentro_prazo"], medida["fora_prazo"])
+    graficos.grafico_aprovados.__wrapped__(medida["aprovado"], medida["aprovado_com_ressalvas"])
+    graficos.grafico_status.__wrapped__(tuple(int(v) for v in medida["contagem_status"].values))
+    graficos.grafico_atribuicoes.__wrapped__(tuple(medida["atribuicoes"]["Atribuído"]),
+                                             tuple(int(v) for v in medida["atribuicoes"]["Total"]))
+    graficos.grafico_tempo.__wrapped__(medida["tempos"])
+
+
+def medir_tempo(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def medir_pico(funcao):
+    """Pico de memória alocada durante `funcao` (MB), além do que já estava alocado antes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return (pico - antes) / 1024 ** 2
+
+
+def executar(linhas, funcionarios=40, amostra=5, seed=0):
+    """{etapa: {"ms": ..., "pico_mb": ...}} para uma planilha de `linhas` tarefas."""
+    planilha = gerar_planilha(linhas, funcionarios, seed=seed)
+    df_tarefas, df_textos, df_usuarios = _parse(planilha)
+    nomes = dados.lista_funcionarios(df_usuarios)
+    # Aquece os índices e o cubo compartilhados: tabelas e gráficos medem só o que é feito por página
+    filtros.obter_filtro(df_tarefas)
+    metricas.obter_cubo(df_tarefas)
+
+    etapas = {
+        "parse": lambda: _parse(planilha),
+        "filtro": lambda: _filtro(df_tarefas, nomes),
+        "prazo": lambda: metricas.classificar_prazo(df_tarefas),
+        "agregacao": lambda: _agregacao(df_tarefas, nomes),
+        "tabelas": lambda: _tabelas(df_tarefas, df_textos, nomes[:amostra]),
+        "graficos": lambda: _graficos(df_tarefas, df_textos, nomes[0]),
+    }
+    repeticoes = 3 if linhas <= 100_000 else 1
+    resultados = {}
+    for nome, funcao in etapas.items():
+        funcao()  # aquecimento (imports, caches do pandas/matplotlib)
+        resultados[nome] = {
+            "ms": round(medir_tempo(funcao, repeticoes) * 1000, 1),
+            "pico_mb": round(medir_pico(funcao), 1),
+        }
+    return resultados
+
+
+def _variacao(atual, base):
+    if base is None or base == 0:
+        return ""
+    return f"{(atual - base) / base * 100:+.0f}%"
+
+
+def relatorio(resultados, baseline, tolerancia):
+    """Imprime a comparação com o baseline; retorna as etapas que pioraram além da `tolerancia` (%)."""
+    pioras = []
+    print(f"{'linhas':>9} {'etapa':<10} {'ms':>10} {'base ms':>10} {'Δ':>6} {'pico MB':>9} {'base MB':>9} {'Δ':>6}")
+    for linhas, etapas in resultados.items():
+        base_linhas = baseline.get(str(linhas), {})
+        for etapa, valores in etapas.items():
+            base = base_linhas.get(etapa, {})
+            base_ms, base_mb = base.get("ms"), base.get("pico_mb")
+            print(f"{linhas:>9} {etapa:<10} {valores['ms']:>10.1f} {base_ms if base_ms is not None else '-':>10} "
+                  f"{_variacao(valores['ms'], base_ms):>6} {valores['pico_mb']:>9.1f} "
+                  f"{base_mb if base_mb is not None else '-':>9} {_variacao(valores['pico_mb'], base_mb):>6}")
+            # Pequenas diferenças absolutas (ruído de medição) não contam como piora
+            if base_ms and valores["ms"] > base_ms * (1 + tolerancia / 100) and valores["ms"] - base_ms > 20:
+                pioras.append(f"{linhas} linhas / {etapa}: tempo {base_ms} -> {valores['ms']} ms")
+            if base_mb and valores["pico_mb"] > base_mb * (1 + tolerancia / 100) and valores["pico_mb"] - base_mb > 1:
+                pioras.append(f"{linhas} linhas / {etapa}: memória {base_mb} -> {valores['pico_mb']} MB")
+    return pioras
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", default=",".join(str(t) for t in TAMANHOS),
+                        help="quantidades de linhas, separadas por vírgula")
+    parser.add_argument("--funcionarios", type=int, default=40)
+    parser.add_argument("--amostra", type=int, default=5, help="funcionários medidos na etapa de tabelas")
+    parser.add_argument("--tolerancia", type=float, default=25, help="piora (%%) aceita antes de falhar")
+    parser.add_argument("--gravar-baseline", action="store_true", help=f"grava os resultados em {BASELINE}")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as arquivo:
+            baseline = json.load(arquivo).get("resultados", {})
+
+    resultados = {}
+    for linhas in (int(t) for t in args.tamanhos.split(",")):
+        print(f"... {linhas} linhas", file=sys.stderr)
+        resultados[linhas] = executar(linhas, args.funcionarios, args.amostra)
+    pioras = relatorio(resultados, baseline, args.tolerancia)
+
+    if args.gravar_baseline:
+        baseline.update({str(linhas): etapas for linhas, etapas in resultados.items()})
+        with open(BASELINE, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "maquina": {"python": platform.python_version(), "sistema": platform.platform(),
+                            "processador": platform.processor() or platform.machine()},
+                "funcionarios": args.funcionarios,
+                "resultados": baseline,
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"Baseline gravado em {BASELINE}")
+        return 0
+    for piora in pioras:
+        print("PIOROU:", piora)
+    return 1 if pioras else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
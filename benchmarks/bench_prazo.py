@@ -0,0 +1,81 @@
+"""Confere `classificar_prazo` contra o laço `iterrows` original e compara os tempos.
+
+Uso: python benchmarks/bench_prazo.py [linhas]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metricas import DENTRO_DO_PRAZO, FORA_DO_PRAZO, STATUS_CONCLUIDOS, classificar_prazo  # noqa: E402
+
+STATUS = ["Pendente", "Concluída", "Aprovado", "Aprovado com ressalvas", "Aguardando Aprovacao",
+          "Para Aprovação", "Deletada", "Sugestão de Melhoria", None]
+
+
+def classificar_prazo_iterrows(df_graph, hoje):
+    """Laço original do dashboard, guardando também o rótulo de cada linha."""
+    rotulos = {}
+    dentro_prazo = 0
+    fora_prazo = 0
+    for idx, row in df_graph.iterrows():
+        prazo = row.get("Prazo")
+        status = row.get("Status")
+        ultima_atualizacao = row.get("Última Atualização")
+        rotulos[idx] = None
+        if pd.notnull(prazo):
+            if status in STATUS_CONCLUIDOS and pd.notnull(ultima_atualizacao):
+                if ultima_atualizacao.date() <= prazo.date():
+                    dentro_prazo += 1
+                    rotulos[idx] = DENTRO_DO_PRAZO
+                else:
+                    fora_prazo += 1
+                    rotulos[idx] = FORA_DO_PRAZO
+            elif status == "Pendente":
+                if hoje.date() > prazo.date():
+                    fora_prazo += 1
+                    rotulos[idx] = FORA_DO_PRAZO
+    return pd.Series(rotulos, dtype=object), dentro_prazo, fora_prazo
+
+
+def gerar_tarefas(linhas, seed=0):
+    """Datas com e sem horário, mesmos dias com horas diferentes e prazos/atualizações ausentes."""
+    aleatorio = np.random.default_rng(seed)
+    base = np.datetime64("2024-01-01T00:00")
+    criacao = base + aleatorio.integers(0, 365 * 24 * 60, linhas).astype("timedelta64[m]")
+    prazo = pd.Series(criacao + aleatorio.integers(-2 * 1440, 10 * 1440, linhas).astype("timedelta64[m]"))
+    ultima = pd.Series(criacao + aleatorio.integers(0, 12 * 1440, linhas).astype("timedelta64[m]"))
+    prazo[aleatorio.random(linhas) < 0.15] = pd.NaT
+    ultima[aleatorio.random(linhas) < 0.1] = pd.NaT
+    return pd.DataFrame({
+        "Status": aleatorio.choice(np.array(STATUS, dtype=object), linhas),
+        "Prazo": prazo,
+        "Última Atualização": ultima,
+    }, index=aleatorio.permutation(linhas) + 2)
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    df = gerar_tarefas(linhas)
+    for hoje in (datetime(2024, 1, 1), datetime(2024, 6, 15, 23, 59), datetime.now()):
+        esperado = classificar_prazo_iterrows(df, hoje)
+        obtido = classificar_prazo(df, hoje)
+        assert esperado[1:] == obtido[1:], (hoje, esperado[1:], obtido[1:])
+        assert esperado[0].equals(obtido[0].reindex(esperado[0].index)), hoje
+    assert classificar_prazo(df.iloc[:0])[1:] == (0, 0)
+
+    hoje = datetime.now()
+    inicio = time.perf_counter()
+    classificar_prazo_iterrows(df, hoje)
+    tempo_antigo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    classificar_prazo(df, hoje)
+    tempo_novo = time.perf_counter() - inicio
+    print(f"{linhas} linhas: resultados idênticos ao laço original")
+    print(f"iterrows:          {tempo_antigo * 1000:8.1f} ms")
+    print(f"classificar_prazo: {tempo_novo * 1000:8.1f} ms  ({tempo_antigo / tempo_novo:.0f}x)")
@@ -0,0 +1,101 @@
+"""Compara `tabelas.html_tabela` com o HTML que o dashboard montava (`to_html`, `str.replace` e Styler).
+
+Usa as tabelas da página (`medicao.medir`) de todos os funcionários de uma
+planilha sintética. Confere que o HTML é idêntico ao do `to_html` (e, na
+linha "Total", que as células e as linhas destacadas são as mesmas do
+Styler) e mede o tempo de cada forma: a antiga, o renderizador sem cache e
+o renderizador com as tabelas já em cache.
+
+Uso: python benchmarks/bench_tabelas.py [linhas] [funcionarios]
+"""
+import os
+import re
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dados  # noqa: E402
+import medicao  # noqa: E402
+import tabelas  # noqa: E402
+from bench_pipeline import _parse, medir_tempo  # noqa: E402
+from sintetico import gerar_planilha  # noqa: E402
+
+INICIO, FIM = date(2023, 1, 1), date(2024, 12, 31)
+RESUMOS = ["resumo_prazo", "resumo_aprovados", "resumo_status", "resumo_atribuicoes",
+           "sugestoes", "desvios", "nao_conformidades"]
+TOTAIS = {"resumo_status": "Status", "resumo_atribuicoes": "Funcionário"}
+
+
+def html_antigo(medida):
+    """HTML das tabelas da página como o dashboard fazia antes de `tabelas.py`."""
+    html = medida["resultado_medicao"].to_html(index=False, header=False, classes="result-table")
+    extra_row = (f'<tr><td colspan="2" style="background-color: {medida["cor_bonificacao"]}; color: white; '
+                 f'text-align: center;">{medida["bonificacao"]}</td></tr>')
+    resultado = [html.replace("</tbody>", extra_row + "</tbody>")]
+    return resultado + [medida[chave].to_html(index=False, classes="summary-table") for chave in RESUMOS]
+
+
+def html_novo(medida):
+    resultado = [tabelas.html_tabela(medida["resultado_medicao"], "result-table", cabecalho=False,
+                                     linha_mesclada=(medida["bonificacao"], medida["cor_bonificacao"]))]
+    return resultado + [tabelas.html_tabela(medida[chave]) for chave in RESUMOS]
+
+
+def total_antigo(df, coluna):
+    return df.style.hide(axis="index").apply(
+        lambda row: ['background-color: #d3d3d3; font-weight: bold' if row[coluna] == "Total" else '' for _ in row],
+        axis=1
+    ).to_html(classes="summary-table")
+
+
+def _celulas_e_destaques(html):
+    """Textos das células (cabeçalho e corpo) e as linhas destacadas, nos dois formatos de HTML."""
+    celulas = [c.strip() for c in re.findall(r"<t[hd][^>]*>(.*?)</t[hd]>", html)]
+    if "<style" in html:  # Styler: as células destacadas são listadas na folha de estilo
+        destaques = {int(r) for r in re.findall(r"_row(\d+)_col\d+", html.split("</style>")[0])}
+    else:
+        linhas = re.findall(r"<tr>(.*?)</tr>", html.split("<tbody>")[1], re.S)
+        destaques = {i for i, linha in enumerate(linhas) if tabelas.ESTILO_TOTAL in linha}
+    return celulas, destaques
+
+
+def main(linhas=20_000, funcionarios=40):
+    df_tarefas, df_textos, df_usuarios = _parse(gerar_planilha(linhas, funcionarios))
+    nomes = dados.lista_funcionarios(df_usuarios)
+    medidas = [medicao.medir(df_tarefas, df_textos, nome, INICIO, FIM) for nome in nomes]
+    maior = max(len(m["sugestoes"]) for m in medidas)
+    print(f"{linhas} tarefas · {len(medidas)} funcionários · até {maior} linhas por lista de registros")
+
+    for nome, medida in zip(nomes, medidas):
+        tabelas._cache.clear()
+        for antigo, novo in zip(html_antigo(medida), html_novo(medida)):
+            assert antigo == novo, f"HTML diferente para {nome}:\n{antigo}\n---\n{novo}"
+        for chave, coluna in TOTAIS.items():
+            antigo = _celulas_e_destaques(total_antigo(medida[chave], coluna))
+            novo = _celulas_e_destaques(tabelas.html_tabela(medida[chave], destacar=(coluna, "Total")))
+            assert antigo == novo, f"Linha Total diferente para {nome} ({chave})"
+    print("HTML idêntico ao do to_html; linha Total com as mesmas células e destaques do Styler")
+
+    def sem_cache(funcao):
+        def executar():
+            for medida in medidas:
+                tabelas._cache.clear()
+                funcao(medida)
+        return executar
+
+    tempos = {
+        "to_html + replace": medir_tempo(lambda: [html_antigo(m) for m in medidas], 3),
+        "html_tabela (sem cache)": medir_tempo(sem_cache(html_novo), 3),
+        "html_tabela (em cache)": medir_tempo(lambda: [html_novo(m) for m in medidas], 3),
+        "Styler (linha Total)": medir_tempo(
+            lambda: [total_antigo(m[c], col) for m in medidas for c, col in TOTAIS.items()], 3),
+        "html_tabela Total (sem cache)": medir_tempo(sem_cache(
+            lambda m: [tabelas.html_tabela(m[c], destacar=(col, "Total")) for c, col in TOTAIS.items()]), 3),
+    }
+    for nome, segundos in tempos.items():
+        print(f"{nome:<32} {segundos * 1000 / len(medidas):>8.2f} ms por página")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,121 @@
+"""Várias sessões do dashboard ao mesmo tempo: confere que a planilha é lida uma vez por intervalo.
+
+Cada sessão é uma thread que repete o que um rerun faz (`dados.carregar_dados`
+e `medicao.medir` de um funcionário) e guarda só o seu resultado, como o
+`session_state` de um navegador. A planilha é uma fixture sintética com
+latência de rede simulada. Para cada quantidade de sessões, confere que:
+
+- a planilha foi lida pelo menos uma vez e no máximo ceil(duração / intervalo) + 1
+  vezes na rodada, qualquer que seja o número de sessões (cada intervalo só
+  começa a contar quando a leitura anterior termina, então ficar abaixo é normal);
+- a memória alocada além dos dados compartilhados cresce no máximo
+  `--memoria-por-sessao` MB a cada sessão a mais que a rodada com menos sessões.
+
+Sai com código 1 se alguma conferência falhar.
+
+Uso:
+    python benchmarks/sessoes_concorrentes.py                    # 1, 4 e 16 sessões
+    python benchmarks/sessoes_concorrentes.py --sessoes 1,8,32 --intervalo 1 --duracao 5
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sintetico import gerar_planilha  # noqa: E402
+
+INICIO, FIM = date(2023, 1, 1), date(2024, 12, 31)
+
+
+def _sessao(dados, medicao, funcionario, ate, resultados):
+    medida = None
+    while time.monotonic() < ate:
+        df_tarefas, df_usuarios, df_textos = dados.carregar_dados()
+        medida = medicao.medir(df_tarefas, df_textos, funcionario, INICIO, FIM)
+        time.sleep(0.05)  # tempo do navegador entre um rerun e outro
+    resultados.append(medida)
+
+
+def rodada(dados, medicao, funcionarios, sessoes, duracao):
+    """Roda `sessoes` threads por `duracao` segundos; retorna (leituras da planilha, memória em MB)."""
+    cargas = dados.cache.cargas
+    antes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    ate = time.monotonic() + duracao
+    resultados = []
+    threads = [threading.Thread(target=_sessao, args=(dados, medicao, funcionarios[i % len(funcionarios)], ate, resultados))
+               for i in range(sessoes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    while dados.cache.recarregando():  # recarga disparada no fim da rodada
+        time.sleep(0.01)
+    pico = tracemalloc.get_traced_memory()[1]
+    return dados.cache.cargas - cargas, (pico - antes) / 1024 ** 2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessoes", default="1,4,16", help="quantidades de sessões, separadas por vírgula")
+    parser.add_argument("--linhas", type=int, default=20_000, help="tarefas da planilha sintética")
+    parser.add_argument("--intervalo", type=float, default=2.0, help="validade do cache (s)")
+    parser.add_argument("--duracao", type=float, default=10.0, help="duração de cada rodada (s)")
+    parser.add_argument("--latencia", type=float, default=0.2, help="latência simulada de cada leitura (s)")
+    parser.add_argument("--memoria-por-sessao", type=float, default=1.0,
+                        help="memória (MB) aceita para cada sessão a mais")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "planilha.json")
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(gerar_planilha(args.linhas), arquivo, ensure_ascii=False)
+        # Configuração lida na importação de dados.py
+        os.environ.update({
+            "DASHBOARD_FIXTURE": caminho,
+            "DASHBOARD_FIXTURE_LATENCIA": str(args.latencia),
+            "DASHBOARD_CACHE_TTL": str(args.intervalo),
+            "DASHBOARD_SNAPSHOT_DIR": os.path.join(pasta, "snapshot"),
+        })
+        import dados
+        import medicao
+
+        tracemalloc.start()
+        df_tarefas, df_usuarios, df_textos = dados.carregar_dados()
+        funcionarios = dados.lista_funcionarios(df_usuarios)
+        medicao.medir(df_tarefas, df_textos, funcionarios[0], INICIO, FIM)  # índices e cubo compartilhados
+        compartilhado = tracemalloc.get_traced_memory()[0] / 1024 ** 2
+
+        maximo = math.ceil(args.duracao / args.intervalo) + 1
+        print(f"{args.linhas} tarefas · dados compartilhados: {compartilhado:.1f} MB · "
+              f"intervalo {args.intervalo:g}s · rodadas de {args.duracao:g}s (1 a {maximo} leituras cada)")
+        print(f"{'sessões':>8} {'leituras':>9} {'MB além do compartilhado':>25}")
+        falhas = []
+        base = None
+        for sessoes in sorted(int(s) for s in args.sessoes.split(",")):
+            leituras, memoria = rodada(dados, medicao, funcionarios, sessoes, args.duracao)
+            print(f"{sessoes:>8} {leituras:>9} {memoria:>25.1f}")
+            if not 1 <= leituras <= maximo:
+                falhas.append(f"{sessoes} sessões: {leituras} leituras (esperado de 1 a {maximo})")
+            if base is None:
+                base = (sessoes, memoria)
+            elif (memoria - base[1]) / (sessoes - base[0]) > args.memoria_por_sessao:
+                falhas.append(f"{sessoes} sessões: {(memoria - base[1]) / (sessoes - base[0]):.2f} MB por sessão a mais "
+                              f"(limite {args.memoria_por_sessao:g} MB)")
+        tracemalloc.stop()
+
+    for falha in falhas:
+        print("FALHOU:", falha)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
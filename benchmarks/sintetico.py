@@ -0,0 +1,116 @@
+"""Planilha "LH Tarefas" sintética (abas "Tarefas" e "IDs Usuários") para benchmarks e testes sem rede.
+
+Gera os valores como o Sheets devolve (listas de células em texto), no mesmo
+formato de `fixture.PlanilhaFixture`:
+
+    python benchmarks/sintetico.py 100000 planilha.json [funcionarios]
+    DASHBOARD_FIXTURE=planilha.json streamlit run dashboard.py
+"""
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+CABECALHO_TAREFAS = ["ID", "Tarefa", "Status", "Atribuidor", "Atribuído", "Data de Criação", "Prazo", "Última Atualização"]
+CABECALHO_USUARIOS = ["ID", "Nome"]
+
+# Vocabulário de status da planilha, com um peso aproximado de cada um
+STATUS = {
+    "Pendente": 0.16,
+    "Concluída": 0.14,
+    "Aprovado": 0.26,
+    "Aprovado com ressalvas": 0.08,
+    "Aguardando Aprovacao": 0.08,
+    "Para Aprovação": 0.06,
+    "Deletada": 0.06,
+    "Sugestão de Melhoria": 0.06,
+    "Desvio Comportamental": 0.05,
+    "Não Conformidade": 0.05,
+}
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Eva", "Fábio", "Gabriela", "Heitor", "Isabela", "João",
+         "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Tiago", "Vitória", "Wagner"]
+SOBRENOMES = ["Almeida", "Barbosa", "Costa", "Dias", "Ferreira", "Gomes", "Lima", "Martins", "Oliveira", "Souza"]
+
+
+def gerar_funcionarios(quantidade):
+    """`quantidade` nomes distintos ("Ana Almeida", "Bruno Almeida", ...)."""
+    return [f"{NOMES[i % len(NOMES)]} {SOBRENOMES[(i // len(NOMES)) % len(SOBRENOMES)]}"
+            + (f" {i // (len(NOMES) * len(SOBRENOMES)) + 1}" if i >= len(NOMES) * len(SOBRENOMES) else "")
+            for i in range(quantidade)]
+
+
+_HORAS = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)], dtype=object)
+
+
+def _formatar(datas, aleatorio, vazias=0.0, invalidas=0.0):
+    """Datas como texto nos dois formatos aceitos por `parse_date`, com células vazias e inválidas."""
+    # Formata cada dia distinto uma vez só (strftime linha a linha domina o tempo em 1M de linhas)
+    dias = datas.astype("datetime64[D]")
+    unicos, posicao = np.unique(dias, return_inverse=True)
+    textos_dia = pd.DatetimeIndex(unicos).strftime("%d/%m/%Y").to_numpy(dtype=object)[posicao]
+    minutos = (datas - dias).astype("timedelta64[m]").astype(np.int64)
+    com_hora = aleatorio.random(len(datas)) < 0.6
+    textos = np.where(com_hora, textos_dia + " " + _HORAS[minutos], textos_dia)
+
+    sorteio = aleatorio.random(len(datas))
+    textos[sorteio < vazias] = ""
+    invalida = (sorteio >= vazias) & (sorteio < vazias + invalidas)
+    # Formatos que a planilha às vezes tem e que o dashboard não aceita (viram NaT)
+    iso = pd.DatetimeIndex(unicos).strftime("%Y-%m-%d").to_numpy(dtype=object)[posicao[invalida]]
+    textos[invalida] = np.where(aleatorio.random(int(invalida.sum())) < 0.5, iso, "sem data")
+    return textos
+
+
+def gerar_planilha(linhas, funcionarios=40, dias=730, autoatribuidas=0.08, seed=0):
+    """Valores das abas {"Tarefas": [[...]], "IDs Usuários": [[...]]}, com cabeçalho.
+
+    Tarefas criadas ao longo de `dias` dias a partir de 01/01/2023, prazos e
+    atualizações antes e depois do prazo, uma fração de tarefas autoatribuídas
+    e textos de tarefa que o Sheets devolve como número.
+    """
+    aleatorio = np.random.default_rng(seed)
+    nomes = np.array(gerar_funcionarios(funcionarios), dtype=object)
+
+    criacao = np.datetime64("2023-01-01T00:00") + aleatorio.integers(0, dias * 24 * 60, linhas).astype("timedelta64[m]")
+    criacao.sort()  # a planilha cresce em ordem de criação
+    prazo = criacao + aleatorio.integers(1, 15 * 1440, linhas).astype("timedelta64[m]")
+    ultima = criacao + aleatorio.integers(0, 20 * 1440, linhas).astype("timedelta64[m]")
+
+    atribuidor = aleatorio.integers(0, funcionarios, linhas)
+    atribuido = aleatorio.integers(0, funcionarios, linhas)
+    autoatribuida = aleatorio.random(linhas) < autoatribuidas
+    atribuido[autoatribuida] = atribuidor[autoatribuida]
+
+    tarefas = np.array([f"Tarefa {i}" for i in range(linhas)], dtype=object)
+    numericas = aleatorio.random(linhas) < 0.02
+    tarefas[numericas] = aleatorio.integers(0, 10000, int(numericas.sum())).astype(str)
+
+    status = aleatorio.choice(np.array(list(STATUS), dtype=object), linhas, p=list(STATUS.values()))
+    colunas = [
+        np.arange(1, linhas + 1).astype(str).astype(object),
+        tarefas,
+        status,
+        nomes[atribuidor],
+        nomes[atribuido],
+        _formatar(criacao, aleatorio, invalidas=0.005),
+        _formatar(prazo, aleatorio, vazias=0.15, invalidas=0.01),
+        _formatar(ultima, aleatorio, vazias=0.05, invalidas=0.01),
+    ]
+    # Textos com espaços repetidos (o HTML das tabelas precisa preservá-los); sorteados por último
+    # para não mudar o resto da planilha gerada com a mesma semente
+    espacadas = np.flatnonzero(aleatorio.random(linhas) < 0.03)
+    tarefas[espacadas] = [f"Tarefa  {i}   revisar  &  <conferir>" for i in espacadas]
+    valores = np.column_stack(colunas).tolist() if linhas else []
+
+    usuarios = [CABECALHO_USUARIOS] + [[str(i + 1), nome] for i, nome in enumerate(nomes)] + [[str(funcionarios + 1), ""]]
+    return {"Tarefas": [CABECALHO_TAREFAS] + valores, "IDs Usuários": usuarios}
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    caminho = sys.argv[2] if len(sys.argv) > 2 else "planilha_sintetica.json"
+    funcionarios = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(gerar_planilha(linhas, funcionarios), arquivo, ensure_ascii=False)
+    print(f"{linhas} tarefas, {funcionarios} funcionários -> {caminho}")
@@ -0,0 +1,93 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import perfil
+from metricas import STATUS_REGISTROS
+
+
+class FiltroTarefas:
+    """Índices sobre df_tarefas, montados uma vez por carga de dados.
+
+    As linhas ficam ordenadas por "Data de Criação" (um intervalo de datas vira
+    um `searchsorted`) e agrupadas por "Atribuidor" e "Atribuído". Cada seção da
+    página pede a sua fatia por aqui em vez de copiar e mascarar o DataFrame
+    inteiro. As fatias mantêm a ordem original da planilha.
+    """
+
+    def __init__(self, df_tarefas):
+        self.df = df_tarefas
+        datas = df_tarefas["Data de Criação"].to_numpy()
+        # NaT vai para o fim da ordenação e nunca entra em um intervalo
+        self._ordem = np.argsort(datas, kind="stable")
+        self._datas = datas[self._ordem]
+        self._validas = int(np.count_nonzero(~np.isnat(self._datas)))
+
+        posicao = np.empty(len(df_tarefas), dtype=np.intp)
+        posicao[self._ordem] = np.arange(len(df_tarefas))
+        registros = df_tarefas["Status"].isin(STATUS_REGISTROS).to_numpy()
+        self._por_atribuido = self._agrupar(df_tarefas["Atribuído"], posicao)
+        self._por_atribuidor = self._agrupar(df_tarefas["Atribuidor"], posicao)
+        self._registros_por_atribuidor = self._agrupar(df_tarefas["Atribuidor"][registros], posicao[registros])
+
+    @staticmethod
+    def _agrupar(coluna, posicao):
+        """{nome: posições (na ordem por data) das linhas desse nome}, via códigos categóricos."""
+        categorias = pd.Categorical(coluna)
+        codigos = categorias.codes
+        ordem = np.argsort(codigos, kind="stable")
+        limites = np.searchsorted(codigos[ordem], np.arange(len(categorias.categories) + 1))
+        return {
+            nome: np.sort(posicao[ordem[limites[i]:limites[i + 1]]])
+            for i, nome in enumerate(categorias.categories)
+        }
+
+    def _intervalo(self, inicio, fim):
+        dtype = self._datas.dtype
+        ini = pd.Timestamp(inicio).to_datetime64().astype(dtype)
+        fim = (pd.Timestamp(fim) + pd.Timedelta(days=1)).to_datetime64().astype(dtype)
+        validas = self._datas[:self._validas]
+        return np.searchsorted(validas, ini, side="left"), np.searchsorted(validas, fim, side="left")
+
+    def _posicoes(self, grupos, nome, inicio, fim):
+        posicoes = grupos.get(nome)
+        if posicoes is None:
+            return np.empty(0, dtype=np.intp)
+        ini, fim = self._intervalo(inicio, fim)
+        return posicoes[np.searchsorted(posicoes, ini):np.searchsorted(posicoes, fim)]
+
+    def _linhas(self, posicoes):
+        return self.df.iloc[np.sort(self._ordem[posicoes])]
+
+    def posicoes_envolvendo(self, funcionario, inicio, fim):
+        """Posições (para `iloc`, na ordem da planilha) das linhas de `tarefas_envolvendo`."""
+        atribuidas = self._posicoes(self._por_atribuidor, funcionario, inicio, fim)
+        recebidas = self._posicoes(self._por_atribuido, funcionario, inicio, fim)
+        return np.sort(self._ordem[np.union1d(atribuidas, recebidas)])
+
+    def tarefas_do_funcionario(self, funcionario, inicio, fim):
+        """Tarefas atribuídas ao funcionário e registros (sugestões, desvios, não conformidades) enviados por ele."""
+        recebidas = self._posicoes(self._por_atribuido, funcionario, inicio, fim)
+        registros = self._posicoes(self._registros_por_atribuidor, funcionario, inicio, fim)
+        return self._linhas(np.union1d(recebidas, registros))
+
+    def tarefas_envolvendo(self, funcionario, inicio, fim):
+        """Todas as tarefas em que o funcionário aparece como Atribuidor ou Atribuído."""
+        return self.df.iloc[self.posicoes_envolvendo(funcionario, inicio, fim)]
+
+
+_filtro_atual = (None, None)
+_lock_filtro = threading.Lock()
+
+
+def obter_filtro(df_tarefas):
+    """Reaproveita os índices enquanto os dados forem os mesmos."""
+    global _filtro_atual
+    with _lock_filtro:
+        df_filtro, filtro = _filtro_atual
+        if df_filtro is not df_tarefas:
+            with perfil.etapa("filtro.indices"):
+                filtro = FiltroTarefas(df_tarefas)
+            _filtro_atual = (df_tarefas, filtro)
+        return filtro
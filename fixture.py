@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range, numericise_all
+
+
+def _aparar(linhas):
+    """Remove células e linhas vazias no fim, como a API do Sheets faz nas respostas."""
+    aparadas = []
+    for linha in linhas:
+        fim = len(linha)
+        while fim and linha[fim - 1] == "":
+            fim -= 1
+        aparadas.append(list(linha[:fim]))
+    while aparadas and not aparadas[-1]:
+        aparadas.pop()
+    return aparadas
+
+
+class _RespostaErro:
+    """Resposta HTTP de erro no formato da API do Sheets, para montar um `APIError` de verdade."""
+
+    MENSAGENS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE"}
+
+    def __init__(self, codigo):
+        self.status_code = codigo
+        self.headers = {}
+        self.text = self.MENSAGENS.get(codigo, "ERROR")
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": f"Erro simulado {self.status_code}", "status": self.text}}
+
+
+class _Simulacao:
+    """Latência e falhas simuladas, compartilhadas pelas abas de uma planilha (a cota da API é por usuário)."""
+
+    def __init__(self, falhas=(), latencia=0.0):
+        self.falhas = list(falhas)
+        self.latencia = latencia
+        self.chamadas = 0
+        self._lock = threading.Lock()
+
+    def chamada(self):
+        with self._lock:
+            self.chamadas += 1
+            codigo = self.falhas.pop(0) if self.falhas else None
+        if self.latencia:
+            time.sleep(self.latencia)
+        if codigo is not None:
+            raise APIError(_RespostaErro(codigo))
+
+
+class AbaFixture:
+    """Aba gravada em arquivo, com a parte da interface de `gspread.Worksheet` usada pelo dashboard."""
+
+    def __init__(self, titulo, valores, simulacao=None):
+        self.title = titulo
+        self.valores = valores
+        self.simulacao = simulacao or _Simulacao()
+
+    def get_all_values(self):
+        self.simulacao.chamada()
+        return self._valores()
+
+    def _valores(self):
+        largura = max((len(linha) for linha in self.valores), default=0)
+        return [list(linha) + [""] * (largura - len(linha)) for linha in self.valores]
+
+    def get_all_records(self):
+        self.simulacao.chamada()
+        valores = self._valores()
+        if not valores:
+            return []
+        cabecalho = valores[0]
+        return [dict(zip(cabecalho, numericise_all(linha, default_blank=""))) for linha in valores[1:]]
+
+    def batch_get(self, ranges):
+        self.simulacao.chamada()
+        valores = self._valores()
+        largura = len(valores[0]) if valores else 0
+        respostas = []
+        for faixa in ranges:
+            grade = a1_range_to_grid_range(faixa)
+            linhas = valores[grade.get("startRowIndex", 0):grade.get("endRowIndex", len(valores))]
+            ini_col = grade.get("startColumnIndex", 0)
+            fim_col = grade.get("endColumnIndex", largura)
+            respostas.append(_aparar([linha[ini_col:fim_col] for linha in linhas]))
+        return respostas
+
+
+class PlanilhaFixture:
+    """Planilha "LH Tarefas" gravada em JSON ({aba: [[célula, ...], ...]}), para rodar sem rede.
+
+    `falhas` são códigos HTTP (ex.: [429, 503]) devolvidos pelas próximas
+    leituras, em ordem; `latencia` é o tempo (s) de cada leitura.
+    """
+
+    def __init__(self, caminho, falhas=(), latencia=0.0):
+        with open(caminho, encoding="utf-8") as arquivo:
+            self.abas = json.load(arquivo)
+        self.simulacao = _Simulacao(falhas, latencia)
+
+    def worksheet(self, titulo):
+        self.simulacao.chamada()
+        return AbaFixture(titulo, self.abas[titulo], self.simulacao)
+
+    def worksheets(self):
+        self.simulacao.chamada()
+        return [AbaFixture(titulo, valores, self.simulacao) for titulo, valores in self.abas.items()]
+
+
+def gravar_fixture(spreadsheet, caminho, abas):
+    """Grava os valores das `abas` de uma planilha real em `caminho` para uso com `PlanilhaFixture`."""
+    conteudo = {aba: spreadsheet.worksheet(aba).get_all_values() for aba in abas}
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(conteudo, arquivo, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    import sys
+
+    import dados
+
+    # Uso: python fixture.py planilha.json  (grava as abas da planilha real para rodar sem rede)
+    gravar_fixture(dados.obter_cliente().open(dados.NOME_PLANILHA), sys.argv[1], [dados.ABA_TAREFAS, dados.ABA_USUARIOS])
@@ -0,0 +1,137 @@
+import io
+import os
+from functools import lru_cache
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+from matplotlib.ticker import MaxNLocator
+
+from metricas import STATUS_LIST
+
+# Quantas imagens de cada gráfico ficam em cache (LRU)
+GRAFICOS_CACHE = int(os.environ.get("DASHBOARD_GRAFICOS_CACHE", "64"))
+# Mesmas opções que o st.pyplot usa para gerar o PNG
+OPCOES_PNG = {"bbox_inches": "tight", "dpi": 200, "format": "png"}
+
+# --- Definir estilo para os gráficos com fallback ---
+available_styles = plt.style.available
+if "ggplot" in available_styles:
+    plt.style.use("ggplot")
+else:
+    plt.style.use("default")
+
+# Definir cores para os gráficos
+dark_blue = "#1f77b4"   # tom de azul escuro
+light_blue = "#aec7e8"  # tom de azul claro
+
+cmap = plt.get_cmap("tab10")
+status_colors = {status: cmap(i) for i, status in enumerate(STATUS_LIST)}
+legend_labels = {
+    "Pendente": "PEND.",
+    "Concluída": "CONC.",
+    "Aprovado": "APR.",
+    "Aprovado com ressalvas": "APR+R.",
+    "Aguardando Aprovacao": "AGU.",
+    "Para Aprovação": "PARA."
+}
+
+
+def _nova_figura(figsize):
+    # Figure direto (fora do pyplot): nada fica registrado no estado global do
+    # matplotlib e a renderização pode rodar em várias sessões ao mesmo tempo
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    fig.patch.set_facecolor("white")
+    ax.set_facecolor("white")
+    return fig, ax
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, **OPCOES_PNG)
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+def _barras_duplas(rotulos, valores):
+    fig, ax = _nova_figura((8, 5))
+    ax.bar(rotulos, valores, width=0.6, color=[dark_blue, light_blue], edgecolor="none")
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.tick_params(axis="x", labelsize=14)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.set_xlim(-0.5, 1.5)
+    return _png(fig)
+
+
+@lru_cache(maxsize=GRAFICOS_CACHE)
+def grafico_prazo(dentro_prazo, fora_prazo):
+    """Gráfico 1: tarefas concluídas dentro vs fora do prazo (PNG)."""
+    return _barras_duplas(["Dentro do Prazo", "Fora do Prazo"], [dentro_prazo, fora_prazo])
+
+
+@lru_cache(maxsize=GRAFICOS_CACHE)
+def grafico_aprovados(aprovado, aprovado_com_ressalvas):
+    """Gráfico 2: "Aprovado" vs "Aprovado com ressalvas" (PNG)."""
+    return _barras_duplas(["Aprovado", "Aprovado com ressalvas"], [aprovado, aprovado_com_ressalvas])
+
+
+@lru_cache(maxsize=GRAFICOS_CACHE)
+def grafico_status(contagens):
+    """Total de tarefas recebidas por status; `contagens` segue a ordem de STATUS_LIST (PNG)."""
+    fig, ax = _nova_figura((12, 6))
+    ax.bar(STATUS_LIST, contagens, width=0.6,
+           color=[status_colors[status] for status in STATUS_LIST], edgecolor="none")
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.set_xticklabels([])
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    fig.subplots_adjust(right=0.8)
+    legend_handles = [Patch(facecolor=status_colors[status], label=legend_labels[status]) for status in STATUS_LIST]
+    ax.legend(handles=legend_handles, loc="upper left", bbox_to_anchor=(1.02, 1), fontsize=10, frameon=False)
+    return _png(fig)
+
+
+@lru_cache(maxsize=GRAFICOS_CACHE)
+def grafico_atribuicoes(nomes, totais):
+    """Tarefas atribuídas pelo funcionário, por Atribuído (PNG)."""
+    fig, ax = _nova_figura((12, 6))
+    ax.bar(nomes, totais, color=dark_blue, width=0.6)
+    ax.set_xlabel("Funcionários (Atribuídos)")
+    ax.set_ylabel("Número de tarefas")
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    return _png(fig)
+
+
+@lru_cache(maxsize=GRAFICOS_CACHE)
+def grafico_tempo(tempos):
+    """Tempo de realização (dias) das tarefas concluídas, em ordem cronológica (PNG)."""
+    fig, ax = _nova_figura((12, 6))
+    ax.plot(range(len(tempos)), tempos, marker='o', linestyle='-', color=dark_blue)
+    avg_time = float(np.mean(tempos)) if len(tempos) > 0 else 0
+    ax.axhline(avg_time, color='red', linestyle='--', linewidth=1)
+    ax.text(0.95, 0.95, f"Tempo médio: {avg_time:.1f} dias",
+            transform=ax.transAxes, color='red', fontsize=10, ha='right', va='top',
+            bbox=dict(facecolor='white', alpha=0.7, edgecolor='none'))
+    ax.set_xlabel("Tarefas (ordem cronológica)")
+    ax.set_ylabel("Tempo de realização (dias)")
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    return _png(fig)
+
+
+GRAFICOS = [grafico_prazo, grafico_aprovados, grafico_status, grafico_atribuicoes, grafico_tempo]
+
+
+def estatisticas():
+    """Acertos, falhas e imagens em cache somando todos os gráficos."""
+    infos = [g.cache_info() for g in GRAFICOS]
+    return {
+        "acertos": sum(i.hits for i in infos),
+        "falhas": sum(i.misses for i in infos),
+        "em_cache": sum(i.currsize for i in infos),
+        "limite": GRAFICOS_CACHE * len(GRAFICOS),
+    }
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import filtros
+import metricas
+import perfil
+import tipagem
+
+
+def _registros(df_filtrado, df_textos, status, rotulo):
+    """Data e texto dos registros (`status`) enviados pelo funcionário; vazio se não houver."""
+    df_status = df_filtrado[df_filtrado["Status"] == status]
+    if df_status.empty:
+        return pd.DataFrame(columns=["Data", rotulo])
+    tabela = tipagem.com_textos(df_status, df_textos, ["Tarefa"])[["Data de Criação", "Tarefa"]]
+    tabela = tabela.rename(columns={"Data de Criação": "Data", "Tarefa": rotulo})
+    tabela["Data"] = tabela["Data"].dt.strftime("%d/%m/%Y")
+    return tabela
+
+
+def medir(df_tarefas, df_textos, funcionario, inicio, fim):
+    """Todos os resultados da página do `funcionario` entre `inicio` e `fim`, sem depender do Streamlit.
+
+    Retorna um dict com a tabela "Resultado de medição" e a bonificação, as
+    séries dos gráficos e as tabelas de resumo, já prontas para exibir.
+    """
+    with perfil.etapa("filtro"):
+        df_filtrado = filtros.obter_filtro(df_tarefas).tarefas_do_funcionario(funcionario, inicio, fim)
+
+    with perfil.etapa("metricas.resumo"):
+        resumo = metricas.obter_cubo(df_tarefas).resumo(funcionario, inicio, fim)
+    contagem_status = resumo["contagem_status"]
+    dentro_prazo, fora_prazo = resumo["dentro_prazo"], resumo["fora_prazo"]
+    aprovado, aprovado_com_ressalvas = resumo["aprovado"], resumo["aprovado_com_ressalvas"]
+
+    total_prazo = dentro_prazo + fora_prazo
+    perc_dentro = metricas.percentual(dentro_prazo, total_prazo)
+    perc_fora = metricas.percentual(fora_prazo, total_prazo)
+    total_aprovados = aprovado + aprovado_com_ressalvas
+    perc_aprovado = metricas.percentual(aprovado, total_aprovados)
+    perc_aprovado_com = metricas.percentual(aprovado_com_ressalvas, total_aprovados)
+
+    resultado_medicao = pd.DataFrame({
+        "Métrica": metricas.METRICAS_RESULTADO,
+        "Valor": [int(contagem_status.sum()), int(resumo["atribuicoes"]["Total"].sum()),
+                  f"{perc_fora:.0f}%", f"{perc_aprovado_com:.0f}%",
+                  resumo["sugestao"], resumo["desvio"], resumo["nao_conformidade"]]
+    })
+    bonificacao, cor_bonificacao = metricas.bonificacao(perc_fora, perc_aprovado_com)
+
+    resumo_status = pd.DataFrame({"Status": metricas.STATUS_LIST, "Tarefas": contagem_status.values.astype(int)})
+    resumo_status = pd.concat(
+        [resumo_status, pd.DataFrame({"Status": ["Total"], "Tarefas": [resumo_status["Tarefas"].sum()]})],
+        ignore_index=True,
+    )
+
+    atribuicoes = resumo["atribuicoes"].sort_values("Total", ascending=False)
+    resumo_atribuicoes = pd.concat(
+        [atribuicoes, pd.DataFrame({"Atribuído": ["Total"], "Total": [atribuicoes["Total"].sum()]})],
+        ignore_index=True,
+    ).rename(columns={"Atribuído": "Funcionário", "Total": "Tarefas"})
+
+    with perfil.etapa("metricas.tempo"):
+        df_concluidas = df_filtrado[df_filtrado["Status"].isin(metricas.STATUS_CONCLUIDOS)]
+        df_concluidas = df_concluidas.dropna(subset=["Data de Criação", "Última Atualização"])
+        df_concluidas = df_concluidas.sort_values("Data de Criação")
+        tempos = (df_concluidas["Última Atualização"] - df_concluidas["Data de Criação"]).dt.total_seconds() / (3600*24)
+
+    with perfil.etapa("metricas.registros"):
+        sugestoes = _registros(df_filtrado, df_textos, "Sugestão de Melhoria", "Sugestão")
+        desvios = _registros(df_filtrado, df_textos, "Desvio Comportamental", "Desvio")
+        nao_conformidades = _registros(df_filtrado, df_textos, "Não Conformidade", "Não Conformidade")
+
+    return {
+        "resultado_medicao": resultado_medicao,
+        "bonificacao": bonificacao,
+        "cor_bonificacao": cor_bonificacao,
+        "dentro_prazo": dentro_prazo,
+        "fora_prazo": fora_prazo,
+        "resumo_prazo": pd.DataFrame({
+            "Dentro do prazo": [int(dentro_prazo), f"{perc_dentro:.0f}%"],
+            "Fora do prazo": [int(fora_prazo), f"{perc_fora:.0f}%"]
+        }),
+        "aprovado": aprovado,
+        "aprovado_com_ressalvas": aprovado_com_ressalvas,
+        "resumo_aprovados": pd.DataFrame({
+            "Aprovado": [aprovado, f"{perc_aprovado:.0f}%"],
+            "Aprovado com ressalvas": [aprovado_com_ressalvas, f"{perc_aprovado_com:.0f}%"]
+        }),
+        "contagem_status": contagem_status,
+        "resumo_status": resumo_status,
+        "atribuicoes": atribuicoes.reset_index(drop=True),
+        "resumo_atribuicoes": resumo_atribuicoes,
+        "tempos": tuple(tempos),
+        "sugestoes": sugestoes,
+        "desvios": desvios,
+        "nao_conformidades": nao_conformidades,
+    }
+
+
+def pagina_dados(df_tarefas, df_textos, funcionario, inicio, fim, pagina=0, tamanho=50,
+                 colunas=None, ordenar_por=None, crescente=True):
+    """Uma página das tarefas em que o funcionário aparece como Atribuidor ou Atribuído.
+
+    As linhas saem das posições do índice de filtros; só a coluna de ordenação
+    é lida para todas elas, e só a página pedida (com as `colunas` pedidas, na
+    ordem da planilha) é montada. Retorna (página, total de linhas).
+    """
+    posicoes = filtros.obter_filtro(df_tarefas).posicoes_envolvendo(funcionario, inicio, fim)
+    if ordenar_por is not None:
+        fonte = df_textos if ordenar_por in df_textos.columns else df_tarefas
+        chave = fonte[ordenar_por].iloc[posicoes].reset_index(drop=True)
+        if chave.dtype == object:  # células com tipos misturados (números e texto)
+            chave = chave.astype(str)
+        posicoes = posicoes[chave.sort_values(ascending=crescente, kind="stable", na_position="last").index.to_numpy()]
+
+    colunas = list(df_textos.attrs["ordem_colunas"]) if colunas is None else list(colunas)
+    linhas = df_tarefas.iloc[posicoes[pagina * tamanho:(pagina + 1) * tamanho]]
+    linhas = linhas[[c for c in colunas if c in df_tarefas.columns]]
+    textos = [c for c in colunas if c in df_textos.columns]
+    return tipagem.com_textos(linhas, df_textos, textos).reset_index(drop=True), len(posicoes)
+
+
+def bonificacao_periodo(df_tarefas, df_textos, funcionarios, inicio, fim):
+    """Relatório de bonificação de todos os `funcionarios` em um período (ver `metricas.relatorio_bonificacao`)."""
+    return metricas.relatorio_bonificacao(metricas.obter_cubo(df_tarefas), funcionarios, inicio, fim)
+
+
+def periodos_mensais(inicio, fim):
+    """Divide [inicio, fim] em meses do calendário: [(inicio, fim), ...]."""
+    inicio, fim = pd.Timestamp(inicio), pd.Timestamp(fim)
+    periodos = []
+    while inicio <= fim:
+        fim_mes = min(inicio + pd.offsets.MonthEnd(0), fim)
+        periodos.append((inicio.date(), fim_mes.date()))
+        inicio = fim_mes + pd.Timedelta(days=1)
+    return periodos
+
+
+# Dados de cada processo do pool: recebidos uma única vez, na criação do processo
+_dados_processo = None
+
+
+def _iniciar_processo(df_tarefas, df_textos):
+    global _dados_processo
+    _dados_processo = (df_tarefas, df_textos)
+
+
+def _executar_no_processo(funcao, argumentos):
+    return funcao(*_dados_processo, *argumentos)
+
+
+def _em_processos(funcao, df_tarefas, df_textos, pedidos, processos):
+    pedidos = [tuple(p) for p in pedidos]
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(pedidos) <= 1:
+        return [funcao(df_tarefas, df_textos, *p) for p in pedidos]
+    processos = min(processos, len(pedidos))
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                             initargs=(df_tarefas, df_textos)) as pool:
+        # Cada processo monta seus índices e seu cubo uma vez e reaproveita nos pedidos seguintes
+        return list(pool.map(_executar_no_processo, [funcao] * len(pedidos), pedidos,
+                             chunksize=max(1, len(pedidos) // (processos * 4))))
+
+
+def medir_varios(df_tarefas, df_textos, pedidos, processos=None):
+    """`medir` para cada (funcionario, inicio, fim) de `pedidos`, distribuído num pool de processos.
+
+    `processos=None` usa todos os núcleos; com `processos=1` tudo roda no processo atual.
+    Os resultados voltam na ordem dos pedidos.
+    """
+    return _em_processos(medir, df_tarefas, df_textos, pedidos, processos)
+
+
+def bonificacao_periodos(df_tarefas, df_textos, funcionarios, periodos, processos=None):
+    """Relatório de bonificação de cada período de `periodos`, num só DataFrame com a coluna "Período"."""
+    tabelas = _em_processos(bonificacao_periodo, df_tarefas, df_textos,
+                            [(funcionarios, inicio, fim) for inicio, fim in periodos], processos)
+    for (inicio, fim), tabela in zip(periodos, tabelas):
+        tabela.insert(0, "Período", f"{inicio:%d/%m/%Y} - {fim:%d/%m/%Y}")
+    return pd.concat(tabelas, ignore_index=True) if tabelas else pd.DataFrame()
@@ -0,0 +1,225 @@
+import threading
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+import perfil
+
+# Status das tarefas recebidas (gráfico "Total de tarefas atribuídas ao [funcionário]")
+STATUS_LIST = ["Pendente", "Concluída", "Aprovado", "Aprovado com ressalvas", "Aguardando Aprovacao", "Para Aprovação"]
+# Status considerados concluídos na medição de prazo
+STATUS_CONCLUIDOS = ["Concluída", "Aprovado", "Aprovado com ressalvas", "Aguardando Aprovacao"]
+# Registros enviados pelo funcionário (contam para o Atribuidor, não são tarefas)
+STATUS_REGISTROS = ["Desvio Comportamental", "Sugestão de Melhoria", "Não Conformidade"]
+# Status que não contam como tarefas ordenadas
+STATUS_NAO_ORDENADAS = ["Deletada", "Sugestão de Melhoria", "Desvio Comportamental", "Não Conformidade"]
+DENTRO_DO_PRAZO = "Dentro do Prazo"
+FORA_DO_PRAZO = "Fora do Prazo"
+# Percentual máximo de tarefas fora do prazo / aprovadas com ressalvas para liberar a bonificação
+LIMITE_BONIFICACAO = 5
+METRICAS_RESULTADO = [
+    "Total de Tarefas recebidas",
+    "Total de Tarefas ordenadas",
+    "Tarefas realizadas fora do prazo",
+    "Tarefas concluídas com ressalvas",
+    "Sugestão de Melhoria",
+    "Desvio Comportamental",
+    "Não Conformidade"
+]
+
+
+def classificar_prazo(df, hoje=None):
+    """Classifica as tarefas em dentro/fora do prazo, coluna a coluna.
+
+    Regras: tarefas concluídas comparam a data da "Última Atualização" com a do
+    "Prazo"; tarefas "Pendente" estão fora do prazo se hoje já passou do "Prazo";
+    tarefas sem prazo (ou concluídas sem "Última Atualização") não entram na conta.
+
+    Retorna (rótulos, dentro, fora): a Series com `DENTRO_DO_PRAZO`, `FORA_DO_PRAZO`
+    ou None por tarefa e as duas contagens.
+    """
+    hoje = pd.Timestamp(hoje if hoje is not None else datetime.now()).normalize()
+    prazo = df["Prazo"].dt.normalize()
+    ultima_atualizacao = df["Última Atualização"].dt.normalize()
+
+    tem_prazo = prazo.notna()
+    concluida = df["Status"].isin(STATUS_CONCLUIDOS) & ultima_atualizacao.notna()
+    pendente = df["Status"] == "Pendente"
+
+    dentro = tem_prazo & concluida & (ultima_atualizacao <= prazo)
+    fora = tem_prazo & ((concluida & (ultima_atualizacao > prazo)) | (pendente & (hoje > prazo)))
+
+    rotulos = pd.Series(
+        np.select([dentro.to_numpy(), fora.to_numpy()], [DENTRO_DO_PRAZO, FORA_DO_PRAZO], default=None),
+        index=df.index,
+        dtype=object,
+    )
+    return rotulos, int(dentro.sum()), int(fora.sum())
+
+
+def percentual(parte, total):
+    return (parte / total) * 100 if total > 0 else 0
+
+
+def bonificacao(perc_fora, perc_aprovado_com):
+    """Texto e cor da linha de bonificação do "Resultado de medição"."""
+    if (perc_fora > LIMITE_BONIFICACAO) or (perc_aprovado_com > LIMITE_BONIFICACAO):
+        return "Bonificação não autorizada", "red"
+    return "Bonificação autorizada", "green"
+
+
+def _contagens(df, linha, coluna):
+    """Soma de "Tarefas" por (linha, coluna), como tabela com índice e colunas comuns (não categóricos)."""
+    tabela = df.groupby([linha, coluna], observed=True)["Tarefas"].sum().unstack(fill_value=0)
+    tabela.index = tabela.index.astype(object)
+    tabela.columns = tabela.columns.astype(object)
+    return tabela
+
+
+class CuboMetricas:
+    """Contagens de tarefas por (Atribuidor, Atribuído, dia de criação, Status, prazo).
+
+    É montado uma vez por carga de dados; depois, todos os números da página
+    saem de somas sobre as fatias do cubo, sem varrer as tarefas de novo ao
+    trocar de funcionário ou de intervalo de datas.
+    """
+
+    CHAVES = ["Atribuidor", "Atribuído", "Dia", "Status", "Prazo"]
+
+    def __init__(self, df_tarefas, hoje=None):
+        rotulos, _, _ = classificar_prazo(df_tarefas, hoje)
+        chaves = pd.DataFrame({
+            "Atribuidor": df_tarefas["Atribuidor"],
+            "Atribuído": df_tarefas["Atribuído"],
+            "Dia": df_tarefas["Data de Criação"].dt.normalize(),
+            "Status": df_tarefas["Status"],
+            "Prazo": rotulos,
+        })
+        # Tarefas sem data de criação nunca caem em um intervalo de medição
+        chaves = chaves[chaves["Dia"].notna()]
+        cubo = (
+            chaves.groupby(self.CHAVES, dropna=False, sort=False, observed=True)
+            .size()
+            .rename("Tarefas")
+            .reset_index()
+            .sort_values("Dia", kind="stable")
+        )
+        self.cubo = cubo
+        self._por_atribuido = dict(tuple(cubo.groupby("Atribuído", sort=False, observed=True)))
+        self._por_atribuidor = dict(tuple(cubo.groupby("Atribuidor", sort=False, observed=True)))
+
+    @staticmethod
+    def _fatia(grupos, funcionario, inicio, fim):
+        grupo = grupos.get(funcionario)
+        if grupo is None:
+            return pd.DataFrame(columns=CuboMetricas.CHAVES + ["Tarefas"])
+        dias = grupo["Dia"].to_numpy()
+        ini = np.searchsorted(dias, np.datetime64(pd.Timestamp(inicio)), side="left")
+        fim = np.searchsorted(dias, np.datetime64(pd.Timestamp(fim)), side="right")
+        return grupo.iloc[ini:fim]
+
+    def resumo(self, funcionario, inicio, fim):
+        """Todos os números da página do `funcionario` para tarefas criadas entre `inicio` e `fim`."""
+        recebidas = self._fatia(self._por_atribuido, funcionario, inicio, fim)
+        # Excluir tarefas autoatribuídas
+        recebidas = recebidas[recebidas["Atribuidor"] != recebidas["Atribuído"]]
+        por_status = recebidas.groupby("Status", observed=True)["Tarefas"].sum()
+        por_prazo = recebidas.groupby("Prazo")["Tarefas"].sum()
+
+        enviadas = self._fatia(self._por_atribuidor, funcionario, inicio, fim)
+        enviadas_por_status = enviadas.groupby("Status", observed=True)["Tarefas"].sum()
+        ordenadas = enviadas[~enviadas["Status"].isin(STATUS_NAO_ORDENADAS)]
+        atribuicoes = ordenadas.groupby("Atribuído", observed=True)["Tarefas"].sum()
+        atribuicoes = atribuicoes[atribuicoes > 0].sort_index()
+
+        return {
+            "contagem_status": por_status.reindex(STATUS_LIST, fill_value=0).astype(int),
+            "dentro_prazo": int(por_prazo.get(DENTRO_DO_PRAZO, 0)),
+            "fora_prazo": int(por_prazo.get(FORA_DO_PRAZO, 0)),
+            "aprovado": int(por_status.get("Aprovado", 0)),
+            "aprovado_com_ressalvas": int(por_status.get("Aprovado com ressalvas", 0)),
+            "atribuicoes": atribuicoes.rename("Total").rename_axis("Atribuído").reset_index(),
+            "sugestao": int(enviadas_por_status.get("Sugestão de Melhoria", 0)),
+            "desvio": int(enviadas_por_status.get("Desvio Comportamental", 0)),
+            "nao_conformidade": int(enviadas_por_status.get("Não Conformidade", 0)),
+        }
+
+    def resumo_todos(self, funcionarios, inicio, fim):
+        """Os números de `resumo` para vários funcionários de uma vez, numa única passada agrupada.
+
+        Retorna um DataFrame indexado por funcionário com as colunas recebidas,
+        ordenadas, dentro_prazo, fora_prazo, aprovado, aprovado_com_ressalvas,
+        sugestao, desvio e nao_conformidade.
+        """
+        dias = self.cubo["Dia"].to_numpy()
+        ini = np.searchsorted(dias, np.datetime64(pd.Timestamp(inicio)), side="left")
+        fim = np.searchsorted(dias, np.datetime64(pd.Timestamp(fim)), side="right")
+        periodo = self.cubo.iloc[ini:fim]
+
+        recebidas = periodo[periodo["Atribuidor"] != periodo["Atribuído"]]
+        por_status = _contagens(recebidas, "Atribuído", "Status")
+        por_prazo = _contagens(recebidas, "Atribuído", "Prazo")
+        enviadas_por_status = _contagens(periodo, "Atribuidor", "Status")
+        ordenadas = periodo[~periodo["Status"].isin(STATUS_NAO_ORDENADAS) & periodo["Atribuído"].notna()]
+        por_atribuidor = ordenadas.groupby("Atribuidor", observed=True)["Tarefas"].sum()
+        por_atribuidor.index = por_atribuidor.index.astype(object)
+
+        def coluna(tabela, nome):
+            if nome not in tabela.columns:
+                return 0
+            return tabela[nome].reindex(funcionarios, fill_value=0).to_numpy()
+
+        return pd.DataFrame({
+            "recebidas": por_status.reindex(columns=STATUS_LIST, fill_value=0).sum(axis=1)
+                                   .reindex(funcionarios, fill_value=0).to_numpy(),
+            "ordenadas": por_atribuidor.reindex(funcionarios, fill_value=0).to_numpy(),
+            "dentro_prazo": coluna(por_prazo, DENTRO_DO_PRAZO),
+            "fora_prazo": coluna(por_prazo, FORA_DO_PRAZO),
+            "aprovado": coluna(por_status, "Aprovado"),
+            "aprovado_com_ressalvas": coluna(por_status, "Aprovado com ressalvas"),
+            "sugestao": coluna(enviadas_por_status, "Sugestão de Melhoria"),
+            "desvio": coluna(enviadas_por_status, "Desvio Comportamental"),
+            "nao_conformidade": coluna(enviadas_por_status, "Não Conformidade"),
+        }, index=pd.Index(funcionarios, dtype=object, name="Funcionário")).astype(int)
+
+
+def relatorio_bonificacao(cubo, funcionarios, inicio, fim):
+    """Tabela "Resultado de medição" de todos os `funcionarios`, uma linha por funcionário.
+
+    Usa as mesmas regras e a mesma formatação da página de cada funcionário.
+    """
+    totais = cubo.resumo_todos(funcionarios, inicio, fim)
+    total_prazo = totais["dentro_prazo"] + totais["fora_prazo"]
+    total_aprovados = totais["aprovado"] + totais["aprovado_com_ressalvas"]
+    perc_fora = np.where(total_prazo > 0, (totais["fora_prazo"] / total_prazo.where(total_prazo > 0, 1)) * 100, 0)
+    perc_aprovado_com = np.where(
+        total_aprovados > 0, (totais["aprovado_com_ressalvas"] / total_aprovados.where(total_aprovados > 0, 1)) * 100, 0
+    )
+    return pd.DataFrame({
+        "Funcionário": totais.index,
+        METRICAS_RESULTADO[0]: totais["recebidas"].to_numpy(),
+        METRICAS_RESULTADO[1]: totais["ordenadas"].to_numpy(),
+        METRICAS_RESULTADO[2]: [f"{p:.0f}%" for p in perc_fora],
+        METRICAS_RESULTADO[3]: [f"{p:.0f}%" for p in perc_aprovado_com],
+        METRICAS_RESULTADO[4]: totais["sugestao"].to_numpy(),
+        METRICAS_RESULTADO[5]: totais["desvio"].to_numpy(),
+        METRICAS_RESULTADO[6]: totais["nao_conformidade"].to_numpy(),
+        "Bonificação": [bonificacao(f, a)[0] for f, a in zip(perc_fora, perc_aprovado_com)],
+    })
+
+
+_cubo_atual = (None, None, None)
+_lock_cubo = threading.Lock()
+
+
+def obter_cubo(df_tarefas):
+    """Reaproveita o cubo enquanto os dados forem os mesmos (e o dia não virar, por causa do prazo)."""
+    global _cubo_atual
+    with _lock_cubo:
+        df_cubo, dia_cubo, cubo = _cubo_atual
+        if df_cubo is not df_tarefas or dia_cubo != date.today():
+            with perfil.etapa("metricas.cubo"):
+                cubo = CuboMetricas(df_tarefas)
+            _cubo_atual = (df_tarefas, date.today(), cubo)
+        return cubo
@@ -0,0 +1,58 @@
+import streamlit as st
+
+import dados
+import graficos
+import perfil
+import tendencias
+
+st.set_page_config(layout="wide")
+
+# Tempos de cada etapa desta execução (ver perfil.py)
+perfil.iniciar()
+
+# Mesmos dados em cache da página principal (ver dados.py)
+with perfil.etapa("carga"):
+    df_tarefas, df_usuarios, df_textos = dados.carregar_dados()
+
+# Agregados por semana/mês, atualizados só nos períodos que mudaram a cada nova carga
+with perfil.etapa("tendencias"):
+    agregados = tendencias.obter_agregados(df_tarefas)
+
+# --- Sidebar: Filtros ---
+st.sidebar.header("Filtros")
+frequencia = st.sidebar.radio("Agrupar por", list(tendencias.FREQUENCIAS), horizontal=True)
+escopo = st.sidebar.selectbox("Atribuidor", ["Empresa inteira"] + agregados.atribuidores())
+primeiro_dia, ultimo_dia = agregados.intervalo()
+data_inicio = st.sidebar.date_input("Data Início", primeiro_dia)
+data_fim = st.sidebar.date_input("Data Fim", ultimo_dia)
+
+with perfil.etapa("tendencias.serie"):
+    serie = agregados.serie(frequencia, None if escopo == "Empresa inteira" else escopo, data_inicio, data_fim)
+
+# --- Header Principal ---
+titulo = "da empresa" if escopo == "Empresa inteira" else f"das tarefas atribuídas pelo {escopo}"
+st.markdown(f"<h4>Tendências {titulo}</h4>", unsafe_allow_html=True)
+st.markdown(f"<p style='font-size:14px;'>Intervalo: {data_inicio.strftime('%d/%m/%Y')} - {data_fim.strftime('%d/%m/%Y')} · "
+            "tarefas concluídas (sem as autoatribuídas), contadas no período da conclusão</p>", unsafe_allow_html=True)
+
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("<h5 style='text-align: left;'>Tarefas concluídas</h5>", unsafe_allow_html=True)
+    with perfil.etapa("grafico.concluidas"):
+        st.bar_chart(serie["Concluídas"], color=graficos.dark_blue)
+with col2:
+    st.markdown("<h5 style='text-align: left;'>% concluídas fora do prazo</h5>", unsafe_allow_html=True)
+    with perfil.etapa("grafico.fora_prazo"):
+        st.line_chart(serie["% fora do prazo"], color="#d62728")
+
+st.markdown("<h5 style='text-align: left;'>Tempo de realização (dias)</h5>", unsafe_allow_html=True)
+with perfil.etapa("grafico.tempo"):
+    st.line_chart(serie[["Tempo médio (dias)", "Tempo p50 (dias)", "Tempo p90 (dias)"]])
+
+st.markdown("<h6 style='text-align: left;'>Resumo:</h6>", unsafe_allow_html=True)
+with perfil.etapa("tabela.tendencias"):
+    tabela = serie.round(1)
+    tabela.index = tabela.index.strftime("%d/%m/%Y")
+    st.dataframe(tabela, column_config={"Concluídas": st.column_config.NumberColumn(format="%d")})
+
+perfil.finalizar()
@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("dashboard.perfil")
+
+# Quantas medições de cada etapa entram no cálculo de p50/p95
+HISTORICO = int(os.environ.get("DASHBOARD_PERFIL_HISTORICO", "200"))
+# A cada quantas execuções o resumo com p50/p95 vai para o log
+INTERVALO_RESUMO = int(os.environ.get("DASHBOARD_PERFIL_RESUMO", "50"))
+# Arquivo opcional (uma linha JSON por execução) para coletar as métricas
+ARQUIVO_LOG = os.environ.get("DASHBOARD_PERFIL_LOG")
+
+if ARQUIVO_LOG:
+    _handler = logging.FileHandler(ARQUIVO_LOG, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+_historico = defaultdict(lambda: deque(maxlen=HISTORICO))
+_lock = threading.Lock()
+_execucoes = 0
+_atual = threading.local()
+
+
+class Execucao:
+    """Tempos de uma execução (rerun) da página, etapa por etapa."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas = {}
+
+    def registrar(self, nome, segundos):
+        self.etapas[nome] = self.etapas.get(nome, 0.0) + segundos
+
+
+def iniciar():
+    """Começa a medir uma execução da página na thread atual (cada sessão do Streamlit roda na sua)."""
+    _atual.execucao = Execucao()
+    return _atual.execucao
+
+
+@contextmanager
+def etapa(nome):
+    """Mede o bloco e registra em `nome`, na execução atual (se houver) e no histórico do processo."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        execucao = getattr(_atual, "execucao", None)
+        if execucao is not None:
+            execucao.registrar(nome, segundos)
+        else:
+            # Fora de uma execução da página (ex.: recarga em segundo plano) vai direto para o histórico
+            with _lock:
+                _historico[nome].append(segundos)
+
+
+def finalizar():
+    """Fecha a execução atual: guarda os tempos no histórico e manda uma linha JSON para o log."""
+    global _execucoes
+    execucao = getattr(_atual, "execucao", None)
+    if execucao is None:
+        return
+    _atual.execucao = None
+    total = time.perf_counter() - execucao.inicio
+    with _lock:
+        for nome, segundos in execucao.etapas.items():
+            _historico[nome].append(segundos)
+        _historico["total"].append(total)
+        _execucoes += 1
+        resumir = _execucoes % INTERVALO_RESUMO == 0
+    logger.info(json.dumps({
+        "evento": "execucao",
+        "total_ms": round(total * 1000, 1),
+        "etapas_ms": {nome: round(s * 1000, 1) for nome, s in execucao.etapas.items()},
+    }, ensure_ascii=False))
+    if resumir:
+        logger.info(json.dumps({"evento": "resumo", "etapas": resumo().to_dict("records")}, ensure_ascii=False))
+
+
+def resumo():
+    """DataFrame com as medições de cada etapa: quantidade, última, p50 e p95 (ms)."""
+    with _lock:
+        historico = {nome: np.array(valores) * 1000 for nome, valores in _historico.items() if valores}
+    linhas = [
+        {
+            "Etapa": nome,
+            "Medições": len(valores),
+            "Última (ms)": round(float(valores[-1]), 1),
+            "p50 (ms)": round(float(np.percentile(valores, 50)), 1),
+            "p95 (ms)": round(float(np.percentile(valores, 95)), 1),
+        }
+        for nome, valores in historico.items()
+    ]
+    return pd.DataFrame(linhas, columns=["Etapa", "Medições", "Última (ms)", "p50 (ms)", "p95 (ms)"])
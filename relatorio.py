@@ -0,0 +1,89 @@
+import argparse
+import io
+import sys
+from datetime import date, datetime
+
+import dados
+import medicao
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def xlsx_disponivel():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def para_csv(tabela):
+    # BOM para o Excel abrir os acentos corretamente
+    return tabela.to_csv(index=False).encode("utf-8-sig")
+
+
+def para_xlsx(tabela):
+    buffer = io.BytesIO()
+    tabela.to_excel(buffer, index=False, sheet_name="Bonificação")
+    return buffer.getvalue()
+
+
+def gerar(df_tarefas, df_textos, df_usuarios, inicio=None, fim=None, por_mes=False, processos=1):
+    """Relatório de bonificação de todos os funcionários; sem datas, usa o mesmo intervalo padrão do dashboard.
+
+    Com `por_mes`, gera uma tabela por mês do intervalo, distribuídas em `processos` processos.
+    """
+    datas = df_tarefas["Data de Criação"]
+    if inicio is None:
+        inicio = datas.min().date() if not datas.isnull().all() else date.today()
+    if fim is None:
+        fim = datas.max().date() if not datas.isnull().all() else date.today()
+    funcionarios = dados.lista_funcionarios(df_usuarios)
+    if por_mes:
+        tabela = medicao.bonificacao_periodos(df_tarefas, df_textos, funcionarios,
+                                              medicao.periodos_mensais(inicio, fim), processos)
+    else:
+        tabela = medicao.bonificacao_periodo(df_tarefas, df_textos, funcionarios, inicio, fim)
+    return tabela, inicio, fim
+
+
+def _data(texto):
+    try:
+        return datetime.strptime(texto, "%d/%m/%Y").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {texto!r} (use dd/mm/aaaa)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatório de bonificação de todos os funcionários, sem o dashboard.")
+    parser.add_argument("--inicio", type=_data, help="data inicial (dd/mm/aaaa); padrão: primeira tarefa")
+    parser.add_argument("--fim", type=_data, help="data final (dd/mm/aaaa); padrão: última tarefa")
+    parser.add_argument("--saida", help="arquivo .csv ou .xlsx; sem ele, imprime a tabela")
+    parser.add_argument("--por-mes", action="store_true", help="uma tabela por mês do intervalo (coluna Período)")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="processos para calcular os meses em paralelo (0 = todos os núcleos); padrão: 1")
+    args = parser.parse_args(argv)
+
+    if args.saida and not args.saida.lower().endswith((".csv", ".xlsx")):
+        parser.error("--saida deve terminar em .csv ou .xlsx")
+    if args.saida and args.saida.lower().endswith(".xlsx") and not xlsx_disponivel():
+        parser.error("exportar em .xlsx requer o openpyxl (pip install openpyxl)")
+
+    # O relatório sai sempre da planilha atual, nunca do snapshot da última execução
+    df_tarefas, df_usuarios, df_textos = dados.carregar_dados(bloquear=True)
+    tabela, inicio, fim = gerar(df_tarefas, df_textos, df_usuarios, args.inicio, args.fim,
+                                por_mes=args.por_mes, processos=args.processos or None)
+
+    if not args.saida:
+        print(f"Intervalo de medição: {inicio:%d/%m/%Y} - {fim:%d/%m/%Y}")
+        print(tabela.to_string(index=False))
+        return 0
+    conteudo = para_xlsx(tabela) if args.saida.lower().endswith(".xlsx") else para_csv(tabela)
+    with open(args.saida, "wb") as arquivo:
+        arquivo.write(conteudo)
+    print(f"{len(tabela)} linhas ({inicio:%d/%m/%Y} - {fim:%d/%m/%Y}) gravadas em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
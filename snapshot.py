@@ -0,0 +1,78 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # snapshot local fica desativado sem o pyarrow
+    pa = None
+    feather = None
+
+DIRETORIO_SNAPSHOT = os.environ.get("DASHBOARD_SNAPSHOT_DIR", "snapshot")
+COLUNA_LINHA = "__linha__"
+
+
+def disponivel():
+    return feather is not None
+
+
+def _caminhos(diretorio):
+    return (
+        os.path.join(diretorio, "tarefas.feather"),
+        os.path.join(diretorio, "usuarios.feather"),
+        os.path.join(diretorio, "metadados.json"),
+    )
+
+
+def _para_arrow(df):
+    """Colunas com tipos misturados (números e textos vindos da planilha) são gravadas como texto."""
+    df = df.copy()
+    for coluna in df.columns:
+        if df[coluna].dtype == object:
+            try:
+                pa.array(df[coluna])
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df[coluna] = df[coluna].map(lambda x: "" if pd.isnull(x) else str(x))
+    return df
+
+
+def _gravar_atomico(caminho, gravar):
+    temporario = caminho + ".tmp"
+    gravar(temporario)
+    os.replace(temporario, caminho)
+
+
+def salvar(df_tarefas, df_usuarios, cabecalho, diretorio=DIRETORIO_SNAPSHOT):
+    """Grava os DataFrames já tratados em Feather (sem compressão, para permitir memory-map)."""
+    if not disponivel():
+        return
+    os.makedirs(diretorio, exist_ok=True)
+    caminho_tarefas, caminho_usuarios, caminho_meta = _caminhos(diretorio)
+    tarefas = _para_arrow(df_tarefas).rename_axis(COLUNA_LINHA).reset_index()
+    usuarios = _para_arrow(df_usuarios).reset_index(drop=True)
+    _gravar_atomico(caminho_tarefas, lambda c: feather.write_feather(tarefas, c, compression="uncompressed"))
+    _gravar_atomico(caminho_usuarios, lambda c: feather.write_feather(usuarios, c, compression="uncompressed"))
+    metadados = {"cabecalho": cabecalho, "salvo_em": time.time()}
+
+    def gravar_meta(c):
+        with open(c, "w", encoding="utf-8") as arquivo:
+            json.dump(metadados, arquivo, ensure_ascii=False)
+    _gravar_atomico(caminho_meta, gravar_meta)
+
+
+def carregar(diretorio=DIRETORIO_SNAPSHOT):
+    """Lê o snapshot local. Retorna (df_tarefas, df_usuarios, metadados) ou None se não houver."""
+    if not disponivel():
+        return None
+    caminho_tarefas, caminho_usuarios, caminho_meta = _caminhos(diretorio)
+    if not all(os.path.exists(c) for c in (caminho_tarefas, caminho_usuarios, caminho_meta)):
+        return None
+    df_tarefas = feather.read_table(caminho_tarefas, memory_map=True).to_pandas()
+    df_tarefas = df_tarefas.set_index(COLUNA_LINHA).rename_axis(None)
+    df_usuarios = feather.read_table(caminho_usuarios, memory_map=True).to_pandas()
+    with open(caminho_meta, encoding="utf-8") as arquivo:
+        metadados = json.load(arquivo)
+    return df_tarefas, df_usuarios, metadados
@@ -0,0 +1,102 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Quantas tabelas HTML ficam em cache (LRU)
+TABELAS_CACHE = int(os.environ.get("DASHBOARD_TABELAS_CACHE", "256"))
+# Tabelas com menos células que isso são montadas direto: a chave do cache custaria mais que montar
+CELULAS_PARA_CACHE = int(os.environ.get("DASHBOARD_TABELAS_CELULAS_CACHE", "100"))
+# Estilo das células da linha "Total" (o mesmo que o Styler aplicava em `style_total`)
+ESTILO_TOTAL = "background-color: #d3d3d3; font-weight: bold"
+
+# Mesmos escapes do `DataFrame.to_html`: controles viram "\t", "\n", "\r" e o HTML é escapado
+_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_CELULA = re.compile(r"<td>(.*?)</td>")
+
+
+def _texto(valor):
+    # Como o to_html: cada par de espaços vira "&nbsp;&nbsp;", para o navegador não juntar os espaços
+    return str(valor).translate(_ESCAPES).strip().replace("  ", "&nbsp;&nbsp;")
+
+
+def _textos_coluna(serie):
+    """Texto de cada célula da coluna, exatamente como o `to_html` escreveria."""
+    valores = serie.tolist()
+    if serie.dtype.kind in "iub" or all(isinstance(v, (str, int, np.integer)) for v in valores):
+        return [_texto(v) for v in valores]
+    # Números com casas decimais, vazios, datas...: a formatação do próprio pandas, só para esta coluna
+    return _CELULA.findall(serie.to_frame().to_html(index=False, header=False))
+
+
+def _montar(df, classes, cabecalho, destacar, linha_mesclada):
+    linhas_destacadas = set()
+    if destacar is not None:
+        coluna, valor = destacar
+        linhas_destacadas = set(np.flatnonzero((df[coluna] == valor).to_numpy(dtype=bool)))
+
+    partes = [f'<table border="1" class="dataframe{" " + classes if classes else ""}">\n']
+    if cabecalho:
+        partes.append('  <thead>\n    <tr style="text-align: right;">\n')
+        partes.extend(f"      <th>{_texto(c)}</th>\n" for c in df.columns)
+        partes.append("    </tr>\n  </thead>\n")
+    partes.append("  <tbody>\n")
+    colunas = [_textos_coluna(serie) for _, serie in df.items()]
+    for i, celulas in enumerate(zip(*colunas)):
+        abre = f'      <td style="{ESTILO_TOTAL}">' if i in linhas_destacadas else "      <td>"
+        partes.append("    <tr>\n")
+        partes.extend(f"{abre}{celula}</td>\n" for celula in celulas)
+        partes.append("    </tr>\n")
+    partes.append("  ")
+    if linha_mesclada is not None:
+        texto, cor = linha_mesclada
+        partes.append(f'<tr><td colspan="{df.shape[1]}" style="background-color: {cor}; color: white; '
+                      f'text-align: center;">{str(texto).translate(_ESCAPES)}</td></tr>')
+    partes.append("</tbody>\n</table>")
+    return "".join(partes)
+
+
+_cache = OrderedDict()
+_lock_cache = threading.Lock()
+_contagem = {"acertos": 0, "falhas": 0}
+
+
+def _assinatura(df):
+    # repr de cada célula: 3 e 3.0 (escritos de forma diferente na tabela) não se confundem
+    return (tuple(map(str, df.columns)), tuple(map(str, df.dtypes)),
+            tuple(tuple(map(repr, serie.tolist())) for _, serie in df.items()))
+
+
+def html_tabela(df, classes="summary-table", cabecalho=True, destacar=None, linha_mesclada=None):
+    """Tabela HTML de `df` sem o índice, igual à do `to_html(index=False, classes=...)`.
+
+    `destacar=(coluna, valor)` pinta as linhas em que `coluna == valor` (a
+    linha "Total"); `linha_mesclada=(texto, cor)` acrescenta no fim uma linha
+    com uma célula só, branca sobre `cor` (a linha da bonificação). O HTML
+    fica em cache pelo conteúdo da tabela, a partir de `CELULAS_PARA_CACHE` células.
+    """
+    if df.size < CELULAS_PARA_CACHE:
+        return _montar(df, classes, cabecalho, destacar, linha_mesclada)
+    chave = _assinatura(df) + (classes, cabecalho, destacar, linha_mesclada)
+    with _lock_cache:
+        html = _cache.get(chave)
+        if html is not None:
+            _cache.move_to_end(chave)
+            _contagem["acertos"] += 1
+            return html
+    html = _montar(df, classes, cabecalho, destacar, linha_mesclada)
+    with _lock_cache:
+        _contagem["falhas"] += 1
+        if TABELAS_CACHE > 0:
+            _cache[chave] = html
+            if len(_cache) > TABELAS_CACHE:
+                _cache.popitem(last=False)
+    return html
+
+
+def estatisticas():
+    """Acertos, falhas e tabelas em cache."""
+    with _lock_cache:
+        return {**_contagem, "em_cache": len(_cache), "limite": TABELAS_CACHE}
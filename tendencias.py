@@ -0,0 +1,171 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import perfil
+from metricas import STATUS_CONCLUIDOS
+
+# Rótulo -> frequência do pandas (semanas de segunda a domingo)
+FREQUENCIAS = {"Semanal": "W-SUN", "Mensal": "M"}
+QUANTIS = {"p50_dias": 0.5, "p90_dias": 0.9}
+COLUNAS_SERIE = ["Concluídas", "Tempo médio (dias)", "Tempo p50 (dias)", "Tempo p90 (dias)", "% fora do prazo"]
+
+
+def conclusoes(df_tarefas):
+    """Uma linha por tarefa concluída (sem as autoatribuídas), indexada pela linha da planilha.
+
+    Colunas: Atribuidor, concluida_em (dia da "Última Atualização"), dias (tempo
+    de realização), com_prazo e fora (concluída depois do dia do "Prazo", a
+    mesma regra de `metricas.classificar_prazo` para tarefas concluídas).
+    """
+    criacao = df_tarefas["Data de Criação"]
+    ultima = df_tarefas["Última Atualização"]
+    concluida = (
+        df_tarefas["Status"].isin(STATUS_CONCLUIDOS) & criacao.notna() & ultima.notna()
+        & (df_tarefas["Atribuidor"] != df_tarefas["Atribuído"])
+    )
+    df = df_tarefas[concluida]
+    prazo = df["Prazo"].dt.normalize()
+    concluida_em = df["Última Atualização"].dt.normalize()
+    return pd.DataFrame({
+        "Atribuidor": df["Atribuidor"].astype(object),
+        "concluida_em": concluida_em,
+        "dias": (df["Última Atualização"] - df["Data de Criação"]).dt.total_seconds() / (3600*24),
+        "com_prazo": prazo.notna(),
+        "fora": prazo.notna() & (concluida_em > prazo),
+    }, index=df.index)
+
+
+def _agregar(df, chaves):
+    grupos = df.groupby(chaves, observed=True, sort=True)
+    tabela = grupos.agg(
+        concluidas=("dias", "size"),
+        soma_dias=("dias", "sum"),
+        com_prazo=("com_prazo", "sum"),
+        fora_prazo=("fora", "sum"),
+    )
+    quantis = grupos["dias"].quantile(list(QUANTIS.values())).unstack().reindex(columns=list(QUANTIS.values()))
+    quantis.columns = list(QUANTIS)
+    return tabela.join(quantis)
+
+
+class AgregadosPeriodo:
+    """Totais, somas e quantis do tempo de realização por semana/mês, da empresa e de cada Atribuidor.
+
+    As tarefas entram no período em que foram concluídas. A cada nova carga de
+    dados (`atualizar`), só os períodos com tarefas novas, alteradas ou removidas
+    são recalculados; o resto das tabelas é reaproveitado.
+    """
+
+    def __init__(self):
+        self._conclusoes = None
+        self.empresa = {}
+        self.por_atribuidor = {}
+        self.periodos_recalculados = 0
+
+    def atualizar(self, df_tarefas):
+        novas = conclusoes(df_tarefas)
+        if self._conclusoes is None:
+            afetadas = None
+        else:
+            afetadas = self._datas_afetadas(self._conclusoes, novas)
+            if afetadas.empty:
+                self._conclusoes = novas
+                self.periodos_recalculados = 0
+                return
+        self.periodos_recalculados = 0
+        for rotulo, frequencia in FREQUENCIAS.items():
+            periodos = novas["concluida_em"].dt.to_period(frequencia)
+            if afetadas is None:
+                recalcular, base = novas, periodos
+            else:
+                alvo = pd.Index(afetadas.dt.to_period(frequencia).unique())
+                selecao = periodos.isin(alvo)
+                recalcular, base = novas[selecao], periodos[selecao]
+            self.periodos_recalculados += base.nunique()
+            recalcular = recalcular.assign(Período=base)
+            empresa = _agregar(recalcular, "Período")
+            por_atribuidor = _agregar(recalcular, ["Período", "Atribuidor"])
+            if afetadas is not None:
+                manter = ~self.empresa[rotulo].index.isin(alvo)
+                empresa = pd.concat([self.empresa[rotulo][manter], empresa]).sort_index()
+                manter = ~self.por_atribuidor[rotulo].index.get_level_values("Período").isin(alvo)
+                por_atribuidor = pd.concat([self.por_atribuidor[rotulo][manter], por_atribuidor]).sort_index()
+            self.empresa[rotulo] = empresa
+            self.por_atribuidor[rotulo] = por_atribuidor
+        self._conclusoes = novas
+
+    @staticmethod
+    def _datas_afetadas(antes, depois):
+        """Dias de conclusão (antigos e novos) das linhas que entraram, saíram ou mudaram."""
+        posicao = antes.index.get_indexer(depois.index)
+        existe = posicao >= 0
+        mudou = ~existe
+        for coluna in antes.columns:
+            a, d = antes[coluna].to_numpy()[posicao[existe]], depois[coluna].to_numpy()[existe]
+            diferente = a != d
+            if a.dtype == object:  # Atribuidor vazio (NaN) não conta como mudança
+                diferente &= ~(pd.isna(a) & pd.isna(d))
+            mudou[existe] |= diferente
+        saiu = np.ones(len(antes), dtype=bool)
+        saiu[posicao[existe]] = False
+        saiu[posicao[existe][mudou[existe]]] = True
+        return pd.concat([antes["concluida_em"][saiu], depois["concluida_em"][mudou]])
+
+    def serie(self, frequencia, atribuidor=None, inicio=None, fim=None):
+        """Série por período (um "Período" por linha, sem buracos) com as colunas de `COLUNAS_SERIE`.
+
+        `atribuidor=None` é a empresa inteira; `inicio`/`fim` limitam os períodos pela data.
+        """
+        if atribuidor is None:
+            tabela = self.empresa[frequencia]
+        else:
+            tabela = self.por_atribuidor[frequencia]
+            tabela = tabela.xs(atribuidor, level="Atribuidor") if atribuidor in tabela.index.get_level_values(
+                "Atribuidor") else tabela.iloc[0:0].droplevel("Atribuidor")
+        freq = FREQUENCIAS[frequencia]
+        primeiro, ultimo = self.intervalo()
+        inicio = primeiro if inicio is None else inicio
+        fim = ultimo if fim is None else fim
+        periodos = pd.period_range(pd.Timestamp(inicio).to_period(freq), pd.Timestamp(fim).to_period(freq), freq=freq)
+        tabela = tabela.reindex(periodos)
+        concluidas = tabela["concluidas"].fillna(0).astype(int)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            serie = pd.DataFrame({
+                "Concluídas": concluidas,
+                "Tempo médio (dias)": tabela["soma_dias"] / concluidas.where(concluidas > 0),
+                "Tempo p50 (dias)": tabela["p50_dias"],
+                "Tempo p90 (dias)": tabela["p90_dias"],
+                "% fora do prazo": tabela["fora_prazo"] / tabela["com_prazo"].where(tabela["com_prazo"] > 0) * 100,
+            })
+        serie.index = periodos.start_time.rename("Período")
+        return serie
+
+    def intervalo(self):
+        """Primeiro e último dia com tarefas concluídas (hoje, se não houver nenhuma)."""
+        datas = self._conclusoes["concluida_em"] if self._conclusoes is not None else pd.Series(dtype="datetime64[us]")
+        if datas.empty:
+            hoje = pd.Timestamp.today().normalize()
+            return hoje.date(), hoje.date()
+        return datas.min().date(), datas.max().date()
+
+    def atribuidores(self):
+        nomes = self.por_atribuidor[next(iter(FREQUENCIAS))].index.get_level_values("Atribuidor").unique()
+        return sorted(nomes)
+
+
+_agregados = AgregadosPeriodo()
+_df_agregados = None
+_lock_agregados = threading.Lock()
+
+
+def obter_agregados(df_tarefas):
+    """Agregados por período atualizados para `df_tarefas` (só os períodos que mudaram são recalculados)."""
+    global _df_agregados
+    with _lock_agregados:
+        if _df_agregados is not df_tarefas:
+            with perfil.etapa("tendencias.agregados"):
+                _agregados.atualizar(df_tarefas)
+            _df_agregados = df_tarefas
+        return _agregados
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pandas as pd
+
+import perfil
+from metricas import STATUS_CONCLUIDOS, STATUS_LIST, STATUS_NAO_ORDENADAS
+
+COLUNAS_DATA = ["Data de Criação", "Prazo", "Última Atualização"]
+COLUNAS_PESSOA = ["Atribuidor", "Atribuído"]
+# Ordem canônica das categorias de "Status"; valores fora da lista entram no fim
+STATUS_CANONICOS = list(dict.fromkeys(STATUS_LIST + STATUS_CONCLUIDOS + STATUS_NAO_ORDENADAS))
+
+
+# Função para converter datas
+def parse_date(date_str):
+    for fmt in ("%d/%m/%Y %H:%M", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(date_str, fmt)
+        except Exception:
+            continue
+    return pd.NaT
+
+
+def parse_datas(serie):
+    """Versão vetorizada de `parse_date` para uma coluna inteira, com o mesmo resultado (NaT nos inválidos)."""
+    # Valores que não são texto (números, vazios) viram strings que nenhum dos formatos aceita -> NaT
+    textos = serie.astype(str)
+    # Só "%d/%m/%Y %H:%M" aceita ":"; assim cada valor passa por um único formato, sem tentativas falhas
+    com_hora = textos.str.contains(":", regex=False)
+    datas = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[us]")
+    datas[com_hora] = pd.to_datetime(textos[com_hora], format="%d/%m/%Y %H:%M", errors="coerce")
+    datas[~com_hora] = pd.to_datetime(textos[~com_hora], format="%d/%m/%Y", errors="coerce")
+    return datas
+
+
+def preparar_tarefas(df_tarefas):
+    """Normaliza a aba "Tarefas": força "Tarefa" como texto e converte as datas."""
+    # Forçar a coluna "Tarefa" a ser string
+    if "Tarefa" in df_tarefas.columns:
+        df_tarefas["Tarefa"] = df_tarefas["Tarefa"].where(df_tarefas["Tarefa"].notna(), "").astype(str)
+
+    # Ajuste das colunas de datas
+    with perfil.etapa("carga.parse"):
+        for coluna in COLUNAS_DATA:
+            if coluna in df_tarefas.columns:
+                df_tarefas[coluna] = parse_datas(df_tarefas[coluna])
+    return df_tarefas
+
+
+def _categorias(valores, canonicas=()):
+    conhecidas = set(canonicas)
+    extras = [v for v in pd.unique(valores) if pd.notnull(v) and v not in conhecidas]
+    try:
+        extras = sorted(extras)
+    except TypeError:  # tipos misturados na planilha (ex.: números e nomes)
+        pass
+    return list(canonicas) + extras
+
+
+def tipar_tarefas(df_tarefas):
+    """Separa a tabela em colunas tipadas e texto livre. Retorna (df_tarefas, df_textos).
+
+    "Status" vira categórica com a ordem canônica dos status; "Atribuidor" e
+    "Atribuído" compartilham a mesma categórica de nomes (podem ser comparadas
+    entre si); datas e números ficam como estão. O texto livre ("Tarefa" e as
+    demais colunas de texto) vai para `df_textos`, com o mesmo índice, e só é
+    juntado às fatias que precisam dele (ver `com_textos`).
+    """
+    tipadas = {}
+    if "Status" in df_tarefas.columns:
+        status = pd.CategoricalDtype(_categorias(df_tarefas["Status"], STATUS_CANONICOS))
+        tipadas["Status"] = df_tarefas["Status"].astype(status)
+    pessoas = [c for c in COLUNAS_PESSOA if c in df_tarefas.columns]
+    if pessoas:
+        nomes = pd.CategoricalDtype(_categorias(pd.concat([df_tarefas[c] for c in pessoas])))
+        for coluna in pessoas:
+            tipadas[coluna] = df_tarefas[coluna].astype(nomes)
+
+    textos = {}
+    for coluna in df_tarefas.columns:
+        if coluna in tipadas:
+            continue
+        serie = df_tarefas[coluna]
+        if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_datetime64_any_dtype(serie):
+            tipadas[coluna] = serie
+        else:
+            textos[coluna] = serie
+
+    colunas = list(df_tarefas.columns)
+    df_tipado = pd.DataFrame({c: tipadas[c] for c in colunas if c in tipadas}, index=df_tarefas.index)
+    df_textos = pd.DataFrame({c: textos[c] for c in colunas if c in textos}, index=df_tarefas.index)
+    df_textos.attrs["ordem_colunas"] = colunas
+    return df_tipado, df_textos
+
+
+def lista_funcionarios(df_usuarios):
+    """Nomes da aba "IDs Usuários", sem vazios, em ordem alfabética."""
+    return sorted([nome.strip() for nome in df_usuarios["Nome"].dropna().tolist() if nome.strip() != ""])
+
+
+def com_textos(df, df_textos, colunas=None):
+    """Junta a `df` (uma fatia de df_tarefas) as colunas de texto livre, na ordem original da planilha."""
+    colunas = list(df_textos.columns) if colunas is None else colunas
+    completo = pd.concat([df, df_textos.loc[df.index, colunas]], axis=1)
+    return completo[[c for c in df_textos.attrs["ordem_colunas"] if c in completo.columns]]